@@ -0,0 +1,111 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Any, Hashable
+
+_WORD_PATTERN = re.compile(r"\w+")
+# Code names such as load_config, src/remote.py, loadConfig or v2
+_IDENTIFIER_PATTERN = re.compile(r"\b(?:\w+(?:[./]\w+)+|\w*(?:_|\d|[a-z][A-Z])\w*)\b")
+
+# Word and word-pair counts, their norm, and the identifiers of a text in order
+_TextVector = tuple[Counter[str], float, tuple[str, ...]]
+
+
+class LRUCache:
+    """A small thread-safe LRU cache whose entries optionally expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SemanticCache:
+    """A small thread-safe cache answering lookups with the value stored for the most similar texts.
+
+    Keys are tuples of texts compared pairwise by the cosine similarity of
+    their word and word-pair counts, so word order matters as well. Texts
+    naming different identifiers, or the same ones in a different order,
+    never match. A lookup hits when every text of a stored key within the
+    same `scope` is at least `threshold` similar. The oldest entries are
+    dropped beyond `maxsize`.
+    """
+
+    def __init__(self, maxsize: int, threshold: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries: deque[tuple[Hashable, list[_TextVector], Any]] = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _vectorize(text: str) -> _TextVector:
+        words = _WORD_PATTERN.findall(text.lower())
+        counts = Counter(words)
+        counts.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+        identifiers = tuple(match.group() for match in _IDENTIFIER_PATTERN.finditer(text))
+        return counts, math.sqrt(sum(count * count for count in counts.values())), identifiers
+
+    @staticmethod
+    def _similarity(a: _TextVector, b: _TextVector) -> float:
+        (a_counts, a_norm, a_identifiers), (b_counts, b_norm, b_identifiers) = a, b
+        if a_identifiers != b_identifiers:
+            return 0.0
+        if not a_norm or not b_norm:
+            return 1.0 if a_norm == b_norm else 0.0
+        dot = sum(count * b_counts[word] for word, count in a_counts.items() if word in b_counts)
+        return dot / (a_norm * b_norm)
+
+    def get(self, texts: tuple[str, ...], scope: Hashable = None, default: Any = None) -> Any:
+        vectors = [self._vectorize(text) for text in texts]
+        best_similarity, best_value = 0.0, default
+        with self._lock:
+            for entry_scope, entry_vectors, value in self._entries:
+                if entry_scope != scope or len(entry_vectors) != len(vectors):
+                    continue
+                similarity = min(map(self._similarity, vectors, entry_vectors), default=1.0)
+                if similarity > best_similarity:
+                    best_similarity, best_value = similarity, value
+        return best_value if best_similarity >= self.threshold else default
+
+    def set(self, texts: tuple[str, ...], value: Any, scope: Hashable = None) -> None:
+        vectors = [self._vectorize(text) for text in texts]
+        with self._lock:
+            self._entries.append((scope, vectors, value))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
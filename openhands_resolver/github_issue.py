@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 
@@ -19,3 +21,15 @@ class GithubIssue(BaseModel):
     thread_ids: list[str] | None = None
     head_branch: str | None = None
 
+    @classmethod
+    def from_rest(cls, data: dict[str, Any], owner: str, repo: str, **fields: Any) -> "GithubIssue":
+        """Build an issue from a Github REST API issue or pull request object."""
+        return cls(
+            owner=owner,
+            repo=repo,
+            number=data["number"],
+            title=data["title"],
+            body=data.get("body") or "",
+            head_branch=(data.get("head") or {}).get("ref"),
+            **fields,
+        )
@@ -1,17 +1,100 @@
+from __future__ import annotations
+
+import itertools
 import re
 import os
 from abc import ABC, abstractmethod
-from typing import ClassVar, Any
-import requests
-import litellm
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache, cached_property, lru_cache
+from typing import TYPE_CHECKING, ClassVar, Any, Iterator
 import jinja2
 import json
 
-from openhands.events.event import Event
+from openhands_resolver.cache_utils import LRUCache, SemanticCache
 from openhands_resolver.github_issue import GithubIssue, ReviewThread
-from openhands.core.config import LLMConfig
 from openhands.core.logger import openhands_logger as logger
 
+# litellm (and the openhands modules importing it) and requests are slow to
+# import, so they are only loaded by the methods that talk to Github or the LLM
+if TYPE_CHECKING:
+    import requests
+    from openhands.core.config import LLMConfig
+    from openhands.events.event import Event
+
+# Maximum number of Github API requests a handler issues concurrently
+MAX_PARALLEL_REQUESTS = 8
+
+# Maximum number of concurrent LLM calls when checking review threads
+MAX_PARALLEL_LLM_CALLS = 4
+
+# Maximum number of pull requests whose metadata is fetched in one GraphQL query
+PR_METADATA_BATCH_SIZE = 25
+
+# Github REST responses are reused for RESPONSE_CACHE_TTL seconds, then revalidated by ETag
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_TTL = 60
+
+# Number of guess_success verdicts remembered per handler
+GUESS_SUCCESS_CACHE_SIZE = 128
+
+# With OH_RESOLVER_SEMANTIC_CACHE=1, a verdict is also reused for feedback at least this
+# similar to that of an earlier check of the same issues and agent message
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# With OH_RESOLVER_FAST_PATH=1, feedback whose key terms all appear in the agent's
+# last message is considered addressed without asking the LLM
+QUICK_MATCH_THRESHOLD = 0.9
+QUICK_MATCH_EXPLANATION = "matched by heuristic"
+# Messages admitting a failure always go to the LLM, even if they mention the key terms
+QUICK_MATCH_NEGATION_PATTERN = re.compile(
+    r"\b(?:not|no|cannot|can't|couldn't|didn't|wasn't|unable|fail|fails|failed|failing)\b", re.I
+)
+QUICK_MATCH_KEYWORD_PATTERN = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]{3,}\b")
+QUICK_MATCH_STOPWORDS = frozenset({
+    "about", "also", "could", "does", "feedback", "from", "have", "here", "into",
+    "just", "latest", "like", "make", "more", "only", "please", "should", "some",
+    "sure", "than", "that", "their", "them", "then", "there", "these", "this",
+    "those", "what", "when", "which", "will", "with", "would",
+})
+
+_MISSING = object()
+
+
+# Answer format used by older prompts and by models that ignore the JSON instructions
+SUCCESS_ANSWER_PATTERN = re.compile(r'--- success\n*(true|false)\n*--- explanation*\n((?:.|\n)*)')
+JSON_CODE_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+
+def _parse_success_answer(answer: str) -> tuple[bool, str]:
+    """Parse the success and explanation out of an LLM answer."""
+    fenced = JSON_CODE_FENCE_PATTERN.match(answer)
+    try:
+        data = json.loads(fenced.group(1) if fenced else answer)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict) and isinstance(data.get("success"), bool):
+        return data["success"], str(data.get("explanation", "")).strip()
+
+    match = SUCCESS_ANSWER_PATTERN.search(answer)
+    if match:
+        return match.group(1).lower() == 'true', match.group(2).strip()
+    return False, f"Failed to decode answer from LLM response: {answer}"
+
+
+@cache
+def _load_prompt(name: str) -> str:
+    with open(os.path.join(os.path.dirname(__file__), "prompts", name), 'r') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=32)
+def _compile_template(source: str) -> jinja2.Template:
+    """Compile a jinja template once per process instead of on every render."""
+    return jinja2.Template(source)
+
+
+def _load_template(name: str) -> jinja2.Template:
+    return _compile_template(_load_prompt(name))
 
 
 class IssueHandlerInterface(ABC):
@@ -43,34 +126,114 @@ class IssueHandler(IssueHandlerInterface):
         self.owner = owner
         self.repo = repo
         self.token = token
-    
-    def _download_issues_from_github(self) -> list[Any]:
-        url = self.download_url.format(self.owner, self.repo)
-        headers = {
+        self._response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        self._etag_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+        self._guess_success_cache = LRUCache(maxsize=GUESS_SUCCESS_CACHE_SIZE)
+        self._semantic_cache = SemanticCache(maxsize=GUESS_SUCCESS_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD)
+
+    @cached_property
+    def _session(self) -> requests.Session:
+        return self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Create the HTTP session shared by all Github API requests of this handler.
+
+        Reusing pooled keep-alive connections avoids a TCP/TLS handshake per
+        request, and transient gateway errors are retried with backoff.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        session.headers.update({
             "Authorization": f"token {self.token}",
             "Accept": "application/vnd.github.v3+json",
-        }
-        params: dict[str, int | str] = {"state": "open", "per_page": 100, "page": 1}
-        all_issues = []
+        })
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            # GraphQL queries are sent as POST but are safe to repeat
+            allowed_methods=["GET", "POST"],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        session.mount("https://", adapter)
+        return session
 
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            issues = response.json()
+    def _get_json(self, url: str, params: dict[str, Any]) -> Any:
+        """Download a page from the Github REST API.
 
-            if not issues:
-                break
+        Responses are cached for a short time, so pages requested again within
+        the same run do not cost another round-trip. After that, the page is
+        requested conditionally with its ETag and reused if it has not changed.
+        """
+        cache_key = (url, tuple(sorted(params.items())))
+        cached = self._response_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        # Revalidate pages seen before; a 304 is free of rate limit and has no body
+        headers = {}
+        validated = self._etag_cache.get(cache_key)
+        if validated is not None:
+            headers["If-None-Match"] = validated[0]
+
+        response = self._session.get(url, params=params, headers=headers)
+        if validated is not None and response.status_code == 304:
+            data = validated[1]
+        else:
+            response.raise_for_status()
+            data = response.json()
+            etag = response.headers.get("ETag")
+            if etag:
+                self._etag_cache.set(cache_key, (etag, data))
+        self._response_cache.set(cache_key, data)
+        return data
+
+    def _paginate(self, url: str, params: dict[str, Any], prefetch: bool = False) -> Iterator[list[Any]]:
+        """Yield the pages of a Github REST API listing until an empty page is returned.
+
+        Pages are downloaded lazily, so callers can start processing the first
+        page before the rest of the listing has been fetched. With `prefetch`,
+        the next page is requested in the background while the caller works on
+        the current one. The background thread only lives as long as the listing.
+        """
+        prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="github-prefetch") if prefetch else None
+        page = 1
+        next_page: Future[Any] | None = None
+        try:
+            while True:
+                if next_page is not None:
+                    items = next_page.result()
+                else:
+                    items = self._get_json(url, {**params, "page": page})
+
+                if not items:
+                    return
+
+                if prefetch_executor is not None:
+                    next_page = prefetch_executor.submit(self._get_json, url, {**params, "page": page + 1})
+                yield items
+                page += 1
+        finally:
+            # A listing abandoned by the caller does not wait for its prefetched page
+            if prefetch_executor is not None:
+                prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _download_issues_from_github(self) -> Iterator[dict[str, Any]]:
+        url = self.download_url.format(self.owner, self.repo)
+        params: dict[str, int | str] = {"state": "open", "per_page": 100}
 
+        for issues in self._paginate(url, params, prefetch=True):
             if not isinstance(issues, list) or any(
                 [not isinstance(issue, dict) for issue in issues]
             ):
                 raise ValueError("Expected list of dictionaries from Github API.")
 
-            all_issues.extend(issues)
-            assert isinstance(params["page"], int)
-            params["page"] += 1
+            yield from issues
 
-        return all_issues
     def _extract_image_urls(self, issue_body: str) -> list[str]:
         # Regular expression to match Markdown image syntax ![alt text](image_url)
         image_pattern = r'!\[.*?\]\((https?://[^\s)]+)\)'
@@ -79,21 +242,9 @@ class IssueHandler(IssueHandlerInterface):
     def _get_issue_comments(self, issue_number: int, comment_id: int | None = None) -> list[str] | None:
         """Download comments for a specific issue from Github."""
         url = f"https://api.github.com/repos/{self.owner}/{self.repo}/issues/{issue_number}/comments"
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
-        params = {"per_page": 100, "page": 1}
         all_comments = []
 
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            comments = response.json()
-
-            if not comments:
-                break
-
+        for comments in self._paginate(url, {"per_page": 100}):
             if comment_id:
                 matching_comment = next((comment["body"] for comment in comments if comment["id"] == comment_id), None)
                 if matching_comment:
@@ -101,8 +252,6 @@ class IssueHandler(IssueHandlerInterface):
             else:
                 all_comments.extend([comment["body"] for comment in comments])
 
-            params["page"] += 1
-
         return all_comments if all_comments else None
     
     def get_converted_issues(self, comment_id: int | None = None) -> list[GithubIssue]:
@@ -111,32 +260,34 @@ class IssueHandler(IssueHandlerInterface):
         Returns:
             List of Github issues.
         """
-        all_issues = self._download_issues_from_github()
-        converted_issues = []
-        for issue in all_issues:
-            if any([issue.get(key) is None for key in ["number", "title", "body"]]):
-                logger.warning(
-                    f"Skipping issue {issue} as it is missing number, title, or body."
-                )
-                continue
-
-            if "pull_request" in issue:
-                continue
-            
-            # Get issue thread comments
-            thread_comments = self._get_issue_comments(issue["number"], comment_id=comment_id)
-            # Convert empty lists to None for optional fields
-            issue_details = GithubIssue(
-                                owner=self.owner,
-                                repo=self.repo,
-                                number=issue["number"],
-                                title=issue["title"],
-                                body=issue["body"],
-                                thread_comments=thread_comments,
-                                review_comments=None,  # Initialize review comments as None for regular issues
-                            )
-                
-            converted_issues.append(issue_details)
+        # Comment threads are independent per issue, so fetch them concurrently,
+        # starting as soon as each page of the issue listing arrives
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as executor:
+            pending = []
+            for issue in self._download_issues_from_github():
+                if any([issue.get(key) is None for key in ["number", "title", "body"]]):
+                    logger.warning(
+                        f"Skipping issue {issue} as it is missing number, title, or body."
+                    )
+                    continue
+
+                if "pull_request" in issue:
+                    continue
+
+                pending.append((issue, executor.submit(self._get_issue_comments, issue["number"], comment_id=comment_id)))
+
+            converted_issues = []
+            for issue, comments_future in pending:
+                # Convert empty lists to None for optional fields
+                issue_details = GithubIssue.from_rest(
+                                    issue,
+                                    owner=self.owner,
+                                    repo=self.repo,
+                                    thread_comments=comments_future.result(),
+                                    review_comments=None,  # Initialize review comments as None for regular issues
+                                )
+
+                converted_issues.append(issue_details)
 
         return converted_issues
 
@@ -151,14 +302,72 @@ class IssueHandler(IssueHandlerInterface):
         images.extend(self._extract_image_urls(issue.body))
         images.extend(self._extract_image_urls(thread_context))
 
-        template = jinja2.Template(prompt_template)
+        template = _compile_template(prompt_template)
         return template.render(body=issue.title + "\n\n" + issue.body + thread_context, repo_instruction=repo_instruction), images
 
 
 
 
     def guess_success(self, issue: GithubIssue, history: list[Event], llm_config: LLMConfig) -> tuple[bool, None | list[bool], str]:
-        """Guess if the issue is fixed based on the history and the issue description."""
+        """Guess if the issue is fixed based on the history and the issue description.
+
+        Verdicts are remembered per handler, so asking again about the same issue,
+        agent message and model does not repeat the LLM calls. With
+        OH_RESOLVER_SEMANTIC_CACHE=1, nearly identical feedback answered by the
+        same agent message reuses an earlier verdict as well.
+        """
+        fast_path = os.environ.get("OH_RESOLVER_FAST_PATH") == "1"
+        semantic_cache = os.environ.get("OH_RESOLVER_SEMANTIC_CACHE") == "1"
+        # Verdicts from the heuristic or the semantic cache must not outlive their flags
+        cache_key = (
+            issue.model_dump_json(),
+            history[-1].message,
+            llm_config.model,
+            llm_config.base_url,
+            fast_path,
+            semantic_cache,
+        )
+        cached = self._guess_success_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if semantic_cache:
+            texts = self._semantic_cache_texts(issue)
+            # Only verdicts for the same agent message, issue descriptions, model and
+            # number of each kind of feedback are interchangeable. These are matched
+            # exactly: word counts miss negations like "the tests still fail", and a
+            # long shared description would drown out different feedback
+            scope = (
+                history[-1].message,
+                issue.body,
+                tuple(issue.closing_issues or []),
+                llm_config.model,
+                llm_config.base_url,
+                len(issue.review_threads or []),
+                len(issue.thread_comments or []),
+                len(issue.review_comments or []),
+            )
+            cached = self._semantic_cache.get(texts, scope)
+            if cached is not None:
+                self._guess_success_cache.set(cache_key, cached)
+                return cached
+
+        result = self._guess_success(issue, history, llm_config)
+        self._guess_success_cache.set(cache_key, result)
+        if semantic_cache:
+            self._semantic_cache.set(texts, result, scope)
+        return result
+
+    def _semantic_cache_texts(self, issue: GithubIssue) -> tuple[str, ...]:
+        """The pieces of feedback a verdict depends on, each compared by similarity in the semantic cache."""
+        return (
+            *(review_thread.comment for review_thread in issue.review_threads or []),
+            *(issue.thread_comments or []),
+            *(issue.review_comments or []),
+        )
+
+    def _guess_success(self, issue: GithubIssue, history: list[Event], llm_config: LLMConfig) -> tuple[bool, None | list[bool], str]:
+        """Ask the LLM whether the issue is fixed."""
        
         last_message = history[-1].message
         # Include thread comments in the prompt if they exist
@@ -166,25 +375,51 @@ class IssueHandler(IssueHandlerInterface):
         if issue.thread_comments:
             issue_context += "\n\nIssue Thread Comments:\n" + "\n---\n".join(issue.thread_comments)
             
-        with open(os.path.join(os.path.dirname(__file__), "prompts/guess_success/issue-success-check.jinja"), 'r') as f:
-            template = jinja2.Template(f.read())
-        prompt = template.render(issue_context=issue_context, last_message=last_message)
+        template = _load_template("guess_success/issue-success-check.jinja")
+        prompt = template.render(last_message=last_message)
+        system_prompt = _load_template("guess_success/issue-success-check-system.jinja").render(issue_context=issue_context)
+
+        success, explanation = self._check_feedback_with_llm(system_prompt, prompt, llm_config)
+        return success, None, explanation
+
+    def _build_messages(self, system_prompt: str, prompt: str, llm_config: LLMConfig) -> list[dict[str, Any]]:
+        """Build the chat messages for a success check.
+
+        The instructions and the issue descriptions come first as the system
+        message. For a PR they are the same in every check of the same kind, so
+        providers can reuse the cached prefix across its review threads; only the
+        feedback and the agent's message in the user message vary. Providers
+        ignore the cache breakpoint when the prefix is shorter than their minimum
+        (1024 tokens for Anthropic and OpenAI), e.g. for short issue descriptions.
+        """
+        from openhands.llm.llm import CACHE_PROMPT_SUPPORTED_MODELS
+
+        system_message: dict[str, Any] = {"role": "system", "content": system_prompt}
+        if llm_config.caching_prompt and (
+            llm_config.model in CACHE_PROMPT_SUPPORTED_MODELS
+            or llm_config.model.split("/")[-1] in CACHE_PROMPT_SUPPORTED_MODELS
+        ):
+            system_message["content"] = [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ]
+        return [system_message, {"role": "user", "content": prompt}]
+
+    def _check_feedback_with_llm(self, system_prompt: str, prompt: str, llm_config: LLMConfig) -> tuple[bool, str]:
+        """Helper function to check feedback with LLM and parse response"""
+        import litellm
 
         response = litellm.completion(
-
             model=llm_config.model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=self._build_messages(system_prompt, prompt, llm_config),
             api_key=llm_config.api_key,
             base_url=llm_config.base_url,
+            response_format={"type": "json_object"},
+            # Providers without JSON mode still get the prompt asking for JSON
+            drop_params=True,
         )
         
         answer = response.choices[0].message.content.strip()
-        pattern = r'--- success\n*(true|false)\n*--- explanation*\n((?:.|\n)*)'
-        match = re.search(pattern, answer)
-        if match:
-            return match.group(1).lower() == 'true', None, match.group(2)
-        
-        return False, None, f"Failed to decode answer from LLM response: {answer}"
+        return _parse_success_answer(answer)
 
 
 
@@ -197,7 +432,56 @@ class PRHandler(IssueHandler):
 
 
 
-    def __download_pr_metadata(self, pull_number: int) -> tuple[list[str], list[str], list[ReviewThread], list[str]]:
+    def _build_batched_pr_query(self, pr_numbers: list[int]) -> str:
+        """Build a single GraphQL query fetching metadata for several pull requests.
+
+        Each pull request is aliased as `pr<number>` so the response can be
+        mapped back to the pull request it belongs to. Only fields read by
+        _parse_pr_metadata are selected, to keep the payload small.
+        """
+        # TODO: grabbing the first 10 issues, 100 review threads, and 100 coments; add pagination to retrieve all
+        pull_requests = "\n".join(
+            f"pr{number}: pullRequest(number: {number}) {{ ...PullRequestMetadata }}"
+            for number in pr_numbers
+        )
+        return f"""
+                query($owner: String!, $repo: String!) {{
+                    repository(owner: $owner, name: $repo) {{
+                        {pull_requests}
+                    }}
+                }}
+
+                fragment PullRequestMetadata on PullRequest {{
+                    closingIssuesReferences(first: 10) {{
+                        edges {{
+                            node {{
+                                body
+                            }}
+                        }}
+                    }}
+                    reviews(first: 100) {{
+                        nodes {{
+                            body
+                        }}
+                    }}
+                    reviewThreads(first: 100) {{
+                        edges{{
+                            node{{
+                                id
+                                isResolved
+                                comments(first: 100) {{
+                                    nodes {{
+                                        body
+                                        path
+                                    }}
+                                }}
+                            }}
+                        }}
+                    }}
+                }}
+            """
+
+    def __download_pr_metadata(self, pull_numbers: list[int]) -> dict[int, tuple[list[str], list[str], list[ReviewThread], list[str]]]:
     
         """
             Run a GraphQL query against the GitHub API for information on 
@@ -205,59 +489,18 @@ class PRHandler(IssueHandler):
                 2. referenced issues the pull request would close
 
             Args:
-                query: The GraphQL query as a string.
-                variables: A dictionary of variables for the query.
-                token: Your GitHub personal access token.
+                pull_numbers: The pull requests to fetch, combined into one query.
 
             Returns:
-                The JSON response from the GitHub API.
+                The closing issues, review comments, review threads and thread ids
+                of each pull request, keyed by pull request number.
         """
         # Using graphql as REST API doesn't indicate resolved status for review comments
-        # TODO: grabbing the first 10 issues, 100 review threads, and 100 coments; add pagination to retrieve all
-        query = """
-                query($owner: String!, $repo: String!, $pr: Int!) {
-                    repository(owner: $owner, name: $repo) {
-                        pullRequest(number: $pr) {
-                            closingIssuesReferences(first: 10) {
-                                edges {
-                                    node {
-                                        body
-                                    }
-                                }
-                            }
-                            url
-                            reviews(first: 100) {
-                                nodes {
-                                    body
-                                    state
-                                }
-                            }
-                            reviewThreads(first: 100) {
-                                edges{
-                                    node{
-                                        id
-                                        isResolved
-                                        comments(first: 100) {
-                                            totalCount
-                                            nodes {
-                                                body
-                                                path
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            """
-
-
+        query = self._build_batched_pr_query(pull_numbers)
 
         variables = {
             "owner": self.owner,
             "repo": self.repo,
-            "pr": pull_number
         }
 
         url = "https://api.github.com/graphql"
@@ -266,13 +509,18 @@ class PRHandler(IssueHandler):
             "Content-Type": "application/json"
         }
         
-        response = requests.post(url, json={"query": query, "variables": variables}, headers=headers)
+        response = self._session.post(url, json={"query": query, "variables": variables}, headers=headers)
         response.raise_for_status()
         response_json = response.json()
 
-        # Parse the response to get closing issue references and unresolved review comments
-        pr_data = response_json.get("data", {}).get("repository", {}).get("pullRequest", {})
+        repository_data = response_json.get("data", {}).get("repository", {})
+        return {
+            number: self._parse_pr_metadata(repository_data.get(f"pr{number}") or {})
+            for number in pull_numbers
+        }
 
+    def _parse_pr_metadata(self, pr_data: dict[str, Any]) -> tuple[list[str], list[str], list[ReviewThread], list[str]]:
+        """Parse closing issue references and unresolved review comments of a pull request."""
         # Get closing issues
         closing_issues = pr_data.get("closingIssuesReferences", {}).get("edges", [])
         closing_issues_bodies = [issue["node"]["body"] for issue in closing_issues]
@@ -318,67 +566,58 @@ class PRHandler(IssueHandler):
     def _get_pr_comments(self, pr_number: int) -> list[str] | None:
         """Download comments for a specific pull request from Github."""
         url = f"https://api.github.com/repos/{self.owner}/{self.repo}/issues/{pr_number}/comments"
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
-        params = {"per_page": 100, "page": 1}
         all_comments = []
 
-        while True:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            comments = response.json()
-
-            if not comments:
-                break
-
+        for comments in self._paginate(url, {"per_page": 100}):
             all_comments.extend([comment["body"] for comment in comments])
-            params["page"] += 1
 
         return all_comments if all_comments else None
 
-    def get_converted_issues(self, comment_id: int | None = None) -> list[GithubIssue]:
-        all_issues = self._download_issues_from_github()
-        converted_issues = []
-        for issue in all_issues:
+    def _iter_valid_prs(self) -> Iterator[dict[str, Any]]:
+        for issue in self._download_issues_from_github():
             # For PRs, body can be None
             if any([issue.get(key) is None for key in ["number", "title"]]):
                 logger.warning(
                     f"Skipping #{issue} as it is missing number or title."
                 )
-                continue            
+                continue
 
-            # Handle None body for PRs
-            body = issue.get("body") if issue.get("body") is not None else ""
-            closing_issues, review_comments, review_threads, thread_ids = self.__download_pr_metadata(issue["number"])
-            head_branch = issue["head"]["ref"]
-            
-            # Get PR thread comments
-            thread_comments = self._get_pr_comments(issue["number"])
-            
-            issue_details = GithubIssue(
-                                owner=self.owner,
-                                repo=self.repo,
-                                number=issue["number"],
-                                title=issue["title"],
-                                body=body,
-                                closing_issues=closing_issues,
-                                review_comments=review_comments,
-                                review_threads=review_threads,
-                                thread_ids=thread_ids,
-                                head_branch=head_branch,
-                                thread_comments=thread_comments
-                            )
-            
-            converted_issues.append(issue_details)
+            yield issue
+
+    def get_converted_issues(self, comment_id: int | None = None) -> list[GithubIssue]:
+        # Metadata and comments are independent per PR, so fetch them concurrently,
+        # starting as soon as a batch of PRs has been listed
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as executor:
+            pending = []
+            for batch in itertools.batched(self._iter_valid_prs(), PR_METADATA_BATCH_SIZE):
+                metadata_future = executor.submit(self.__download_pr_metadata, [pr["number"] for pr in batch])
+                for pr in batch:
+                    pending.append((pr, metadata_future, executor.submit(self._get_pr_comments, pr["number"])))
+
+            converted_issues = []
+            for issue, metadata_future, comments_future in pending:
+                closing_issues, review_comments, review_threads, thread_ids = metadata_future.result()[issue["number"]]
+
+                # For PRs, body can be None; from_rest falls back to an empty body
+                issue_details = GithubIssue.from_rest(
+                                    issue,
+                                    owner=self.owner,
+                                    repo=self.repo,
+                                    closing_issues=closing_issues,
+                                    review_comments=review_comments,
+                                    review_threads=review_threads,
+                                    thread_ids=thread_ids,
+                                    thread_comments=comments_future.result()
+                                )
+
+                converted_issues.append(issue_details)
 
         return converted_issues
 
 
     def get_instruction(self, issue: GithubIssue, prompt_template: str, repo_instruction: str | None = None) -> tuple[str, list[str]]:
         """Generate instruction for the agent"""
-        template = jinja2.Template(prompt_template)
+        template = _compile_template(prompt_template)
         images = []
 
         issues_str = None
@@ -421,90 +660,121 @@ class PRHandler(IssueHandler):
         return instruction, images
     
 
-    def _check_feedback_with_llm(self, prompt: str, llm_config: LLMConfig) -> tuple[bool, str]:
-        """Helper function to check feedback with LLM and parse response"""
-        response = litellm.completion(
-            model=llm_config.model,
-            messages=[{"role": "user", "content": prompt}],
-            api_key=llm_config.api_key,
-            base_url=llm_config.base_url,
-        )
-        
-        answer = response.choices[0].message.content.strip()
-        pattern = r'--- success\n*(true|false)\n*--- explanation*\n((?:.|\n)*)'
-        match = re.search(pattern, answer)
-        if match:
-            return match.group(1).lower() == 'true', match.group(2).strip()
-        return False, f"Failed to decode answer from LLM response: {answer}"
-
     def _check_review_thread(self, review_thread: ReviewThread, issues_context: str, last_message: str, llm_config: LLMConfig) -> tuple[bool, str]:
         """Check if a review thread's feedback has been addressed"""
         files_context = json.dumps(review_thread.files, indent=4)
         
-        with open(os.path.join(os.path.dirname(__file__), "prompts/guess_success/pr-feedback-check.jinja"), 'r') as f:
-            template = jinja2.Template(f.read())
+        template = _load_template("guess_success/pr-feedback-check.jinja")
         
         prompt = template.render(
-            issue_context=issues_context,
             feedback=review_thread.comment,
             files_context=files_context,
             last_message=last_message,
         )
         
-        return self._check_feedback_with_llm(prompt, llm_config)
+        system_prompt = _load_template("guess_success/pr-feedback-check-system.jinja").render(issue_context=issues_context)
+
+        return self._check_feedback_with_llm(system_prompt, prompt, llm_config)
 
     def _check_thread_comments(self, thread_comments: list[str], issues_context: str, last_message: str, llm_config: LLMConfig) -> tuple[bool, str]:
         """Check if thread comments feedback has been addressed"""
         thread_context = "\n---\n".join(thread_comments)
         
-        with open(os.path.join(os.path.dirname(__file__), "prompts/guess_success/pr-thread-check.jinja"), 'r') as f:
-            template = jinja2.Template(f.read())
+        template = _load_template("guess_success/pr-thread-check.jinja")
         
         prompt = template.render(
-            issue_context=issues_context,
             thread_context=thread_context,
             last_message=last_message,
         )
         
-        return self._check_feedback_with_llm(prompt, llm_config)
+        system_prompt = _load_template("guess_success/pr-thread-check-system.jinja").render(issue_context=issues_context)
+
+        return self._check_feedback_with_llm(system_prompt, prompt, llm_config)
 
     def _check_review_comments(self, review_comments: list[str], issues_context: str, last_message: str, llm_config: LLMConfig) -> tuple[bool, str]:
         """Check if review comments feedback has been addressed"""
         review_context = "\n---\n".join(review_comments)
         
-        with open(os.path.join(os.path.dirname(__file__), "prompts/guess_success/pr-review-check.jinja"), 'r') as f:
-            template = jinja2.Template(f.read())
+        template = _load_template("guess_success/pr-review-check.jinja")
         
         prompt = template.render(
-            issue_context=issues_context,
             review_context=review_context,
             last_message=last_message,
         )
         
-        return self._check_feedback_with_llm(prompt, llm_config)
+        system_prompt = _load_template("guess_success/pr-review-check-system.jinja").render(issue_context=issues_context)
 
-    def guess_success(self, issue: GithubIssue, history: list[Event], llm_config: LLMConfig) -> tuple[bool, None | list[bool], str]:
-        """Guess if the issue is fixed based on the history and the issue description."""
+        return self._check_feedback_with_llm(system_prompt, prompt, llm_config)
+
+    def _quick_match(self, history_text: str | None, comment: str) -> list[str] | None:
+        """Cheaply check whether the agent's message mentions the key terms of a comment.
+
+        Returns the key terms found in the message, or None if the LLM has to be asked.
+        """
+        if not history_text or QUICK_MATCH_NEGATION_PATTERN.search(history_text):
+            return None
+        keywords = [
+            keyword for keyword in dict.fromkeys(keyword.lower() for keyword in QUICK_MATCH_KEYWORD_PATTERN.findall(comment))
+            if keyword not in QUICK_MATCH_STOPWORDS
+        ]
+        if not keywords:
+            return None
+        matched = [keyword for keyword in keywords if re.search(re.escape(keyword), history_text, re.I)]
+        if len(matched) / len(keywords) < QUICK_MATCH_THRESHOLD:
+            return None
+        return matched
+
+    def _quick_match_explanation(self, history_text: str | None, comments: list[str]) -> str | None:
+        """Explain why all comments count as addressed by the heuristic, or return None if the LLM has to be asked."""
+        matched: dict[str, None] = {}
+        for comment in comments:
+            keywords = self._quick_match(history_text, comment)
+            if keywords is None:
+                return None
+            matched.update(dict.fromkeys(keywords))
+        return f"{QUICK_MATCH_EXPLANATION}: the agent's last message mentions {', '.join(matched)}"
+
+    def _guess_success(self, issue: GithubIssue, history: list[Event], llm_config: LLMConfig) -> tuple[bool, None | list[bool], str]:
+        """Ask the LLM whether each piece of PR feedback has been addressed."""
         
         last_message = history[-1].message
         issues_context = json.dumps(issue.closing_issues, indent=4)
         success_list = []
         explanation_list = []
 
+        # Optionally skip the LLM for feedback the agent's message obviously covers
+        fast_path = os.environ.get("OH_RESOLVER_FAST_PATH") == "1"
+
         # Handle PRs with file-specific review comments
         if issue.review_threads:
-            for review_thread in issue.review_threads:
-                success, explanation = self._check_review_thread(review_thread, issues_context, last_message, llm_config)
-                success_list.append(success)
-                explanation_list.append(explanation)
+            def check_review_thread(review_thread: ReviewThread) -> tuple[bool, str]:
+                if fast_path:
+                    quick_explanation = self._quick_match_explanation(last_message, [review_thread.comment])
+                    if quick_explanation is not None:
+                        return True, quick_explanation
+                return self._check_review_thread(review_thread, issues_context, last_message, llm_config)
+
+            # Each thread is checked independently, so ask the LLM about them concurrently
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_LLM_CALLS) as executor:
+                for success, explanation in executor.map(check_review_thread, issue.review_threads):
+                    success_list.append(success)
+                    explanation_list.append(explanation)
         # Handle PRs with only thread comments (no file-specific review comments)
         elif issue.thread_comments:
-            success, explanation = self._check_thread_comments(issue.thread_comments, issues_context, last_message, llm_config)
+            quick_explanation = self._quick_match_explanation(last_message, issue.thread_comments) if fast_path else None
+            if quick_explanation is not None:
+                success, explanation = True, quick_explanation
+            else:
+                success, explanation = self._check_thread_comments(issue.thread_comments, issues_context, last_message, llm_config)
             success_list.append(success)
             explanation_list.append(explanation)
         elif issue.review_comments:
             # Handle PRs with only review comments (no file-specific review comments or thread comments)
-            success, explanation = self._check_review_comments(issue.review_comments, issues_context, last_message, llm_config)
+            quick_explanation = self._quick_match_explanation(last_message, issue.review_comments) if fast_path else None
+            if quick_explanation is not None:
+                success, explanation = True, quick_explanation
+            else:
+                success, explanation = self._check_review_comments(issue.review_comments, issues_context, last_message, llm_config)
             success_list.append(success)
             explanation_list.append(explanation)
         else:
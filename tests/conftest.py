@@ -0,0 +1,66 @@
+import json
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+class FakeGithubTransport:
+    """Serves canned responses to requests made through any requests.Session.
+
+    Responses are registered per method and URL, optionally restricted to
+    requests carrying the given query parameters. When several registered
+    responses match a request, the first one is used up, so a sequence of
+    responses can be registered for the same URL; the last one keeps matching.
+    Requests matching no registered response raise a ConnectionError.
+    """
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], list[tuple[dict[str, str], dict]]] = {}
+        self.calls: list[requests.PreparedRequest] = []
+
+    def add(self, method, url, json=None, status=200, headers=None, params=None):
+        route = {"json": json, "status": status, "headers": headers or {}}
+        match_params = {key: str(value) for key, value in (params or {}).items()}
+        self._routes.setdefault((method, url), []).append((match_params, route))
+
+    def requests_to(self, method, url):
+        """The requests sent to `url`, ignoring their query parameters."""
+        return [call for call in self.calls if call.method == method and _split_url(call.url)[0] == url]
+
+    def send(self, request, **kwargs):
+        self.calls.append(request)
+        url, query = _split_url(request.url)
+        routes = self._routes.get((request.method, url), [])
+        matches = [
+            entry for entry in routes
+            if all(query.get(key) == value for key, value in entry[0].items())
+        ]
+        if not matches:
+            raise requests.ConnectionError(f"No response registered for {request.method} {request.url}")
+        if len(matches) > 1:
+            routes.remove(matches[0])
+        route = matches[0][1]
+
+        response = requests.Response()
+        response.status_code = route["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json", **route["headers"]})
+        response._content = b"" if route["json"] is None else json.dumps(route["json"]).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def _split_url(url):
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(query="")), dict(parse_qsl(parts.query))
+
+
+@pytest.fixture
+def github_api(monkeypatch):
+    """Route all HTTP requests to a FakeGithubTransport instead of the network."""
+    transport = FakeGithubTransport()
+    monkeypatch.setattr(HTTPAdapter, "send", transport.send)
+    return transport
@@ -1,47 +1,59 @@
-from unittest.mock import patch, MagicMock
-from openhands_resolver.issue_definitions import IssueHandler, PRHandler
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from openhands_resolver.cache_utils import SemanticCache
+from openhands_resolver.issue_definitions import IssueHandler, PRHandler, _compile_template, _load_template
 from openhands_resolver.github_issue import GithubIssue
 from openhands.events.action.message import MessageAction
 from openhands.core.config import LLMConfig
 
-def test_get_converted_issues_initializes_review_comments():
-    # Mock the necessary dependencies
-    with patch('requests.get') as mock_get:
-        # Mock the response for issues
-        mock_issues_response = MagicMock()
-        mock_issues_response.json.return_value = [{
-            'number': 1,
-            'title': 'Test Issue',
-            'body': 'Test Body'
-        }]
-        # Mock the response for comments
-        mock_comments_response = MagicMock()
-        mock_comments_response.json.return_value = []
-        
-        # Set up the mock to return different responses for different calls
-        # First call is for issues, second call is for comments
-        mock_get.side_effect = [mock_issues_response, mock_comments_response, mock_comments_response]  # Need two comment responses because we make two API calls
-        
-        # Create an instance of IssueHandler
-        handler = IssueHandler('test-owner', 'test-repo', 'test-token')
-        
-        # Get converted issues
-        issues = handler.get_converted_issues()
-        
-        # Verify that we got exactly one issue
-        assert len(issues) == 1
-        
-        # Verify that review_comments is initialized as None
-        assert issues[0].review_comments is None
-        
-        # Verify other fields are set correctly
-        assert issues[0].number == 1
-        assert issues[0].title == 'Test Issue'
-        assert issues[0].body == 'Test Body'
-        assert issues[0].owner == 'test-owner'
-        assert issues[0].repo == 'test-repo'
-
-def test_pr_handler_guess_success_with_thread_comments():
+
+ISSUES_URL = 'https://api.github.com/repos/test-owner/test-repo/issues'
+PULLS_URL = 'https://api.github.com/repos/test-owner/test-repo/pulls'
+GRAPHQL_URL = 'https://api.github.com/graphql'
+
+
+@pytest.fixture(scope="module")
+def llm_success_response():
+    """A stand-in for a litellm completion reporting that the feedback was addressed."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+        content='{"success": true, "explanation": "The changes successfully address the feedback."}'
+    ))])
+
+
+def test_get_converted_issues_initializes_review_comments(github_api):
+    # Serve a single issue without comments
+    github_api.add('GET', ISSUES_URL, json=[{
+        'number': 1,
+        'title': 'Test Issue',
+        'body': 'Test Body'
+    }], params={'page': 1})
+    github_api.add('GET', ISSUES_URL, json=[])
+    github_api.add('GET', f'{ISSUES_URL}/1/comments', json=[])
+
+    # Create an instance of IssueHandler
+    handler = IssueHandler('test-owner', 'test-repo', 'test-token')
+
+    # Get converted issues
+    issues = handler.get_converted_issues()
+
+    # Verify that we got exactly one issue
+    assert len(issues) == 1
+
+    # Verify that review_comments is initialized as None
+    assert issues[0].review_comments is None
+
+    # Verify other fields are set correctly
+    assert issues[0].number == 1
+    assert issues[0].title == 'Test Issue'
+    assert issues[0].body == 'Test Body'
+    assert issues[0].owner == 'test-owner'
+    assert issues[0].repo == 'test-repo'
+
+def test_pr_handler_guess_success_with_thread_comments(llm_success_response):
     # Create a PR handler instance
     handler = PRHandler('test-owner', 'test-repo', 'test-token')
     
@@ -65,22 +77,8 @@ def test_pr_handler_guess_success_with_thread_comments():
     # Create mock LLM config
     llm_config = LLMConfig(model='test-model', api_key='test-key')
     
-    # Mock the LLM response
-    mock_response = MagicMock()
-    mock_response.choices = [
-        MagicMock(
-            message=MagicMock(
-                content="""--- success
-true
-
---- explanation
-The changes successfully address the feedback."""
-            )
-        )
-    ]
-    
     # Test the guess_success method
-    with patch('litellm.completion', return_value=mock_response):
+    with patch('litellm.completion', return_value=llm_success_response):
         success, success_list, explanation = handler.guess_success(issue, history, llm_config)
         
         # Verify the results
@@ -88,76 +86,55 @@ The changes successfully address the feedback."""
         assert success_list == [True]
         assert "successfully address" in explanation
 
-def test_pr_handler_get_converted_issues_with_comments():
-    # Mock the necessary dependencies
-    with patch('requests.get') as mock_get:
-        # Mock the response for PRs
-        mock_prs_response = MagicMock()
-        mock_prs_response.json.return_value = [{
-            'number': 1,
-            'title': 'Test PR',
-            'body': 'Test Body',
-            'head': {'ref': 'test-branch'}
-        }]
-        
-        # Mock the response for PR comments
-        mock_comments_response = MagicMock()
-        mock_comments_response.json.return_value = [
-            {'body': 'First comment'},
-            {'body': 'Second comment'}
-        ]
-        
-        # Mock the response for PR metadata (GraphQL)
-        mock_graphql_response = MagicMock()
-        mock_graphql_response.json.return_value = {
-            'data': {
-                'repository': {
-                    'pullRequest': {
-                        'closingIssuesReferences': {'edges': []},
-                        'reviews': {'nodes': []},
-                        'reviewThreads': {'edges': []}
-                    }
+def test_pr_handler_get_converted_issues_with_comments(github_api):
+    # Serve a single PR with two comments
+    github_api.add('GET', PULLS_URL, json=[{
+        'number': 1,
+        'title': 'Test PR',
+        'body': 'Test Body',
+        'head': {'ref': 'test-branch'}
+    }], params={'page': 1})
+    github_api.add('GET', PULLS_URL, json=[])
+    github_api.add('GET', f'{ISSUES_URL}/1/comments', json=[
+        {'body': 'First comment'},
+        {'body': 'Second comment'}
+    ], params={'page': 1})
+    github_api.add('GET', f'{ISSUES_URL}/1/comments', json=[])
+
+    # Serve the PR metadata (GraphQL)
+    github_api.add('POST', GRAPHQL_URL, json={
+        'data': {
+            'repository': {
+                'pr1': {
+                    'closingIssuesReferences': {'edges': []},
+                    'reviews': {'nodes': []},
+                    'reviewThreads': {'edges': []}
                 }
             }
         }
-        
-        # Set up the mock to return different responses
-        # We need to return empty responses for subsequent pages
-        mock_empty_response = MagicMock()
-        mock_empty_response.json.return_value = []
-        
-        mock_get.side_effect = [
-            mock_prs_response,  # First call for PRs
-            mock_empty_response,  # Second call for PRs (empty page)
-            mock_comments_response,  # Third call for PR comments
-            mock_empty_response,  # Fourth call for PR comments (empty page)
-        ]
-        
-        # Mock the post request for GraphQL
-        with patch('requests.post') as mock_post:
-            mock_post.return_value = mock_graphql_response
-            
-            # Create an instance of PRHandler
-            handler = PRHandler('test-owner', 'test-repo', 'test-token')
-            
-            # Get converted issues
-            prs = handler.get_converted_issues()
-            
-            # Verify that we got exactly one PR
-            assert len(prs) == 1
-            
-            # Verify that thread_comments are set correctly
-            assert prs[0].thread_comments == ['First comment', 'Second comment']
-            
-            # Verify other fields are set correctly
-            assert prs[0].number == 1
-            assert prs[0].title == 'Test PR'
-            assert prs[0].body == 'Test Body'
-            assert prs[0].owner == 'test-owner'
-            assert prs[0].repo == 'test-repo'
-            assert prs[0].head_branch == 'test-branch'
-
-def test_pr_handler_guess_success_only_review_comments():
+    })
+
+    # Create an instance of PRHandler
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    # Get converted issues
+    prs = handler.get_converted_issues()
+
+    # Verify that we got exactly one PR
+    assert len(prs) == 1
+
+    # Verify that thread_comments are set correctly
+    assert prs[0].thread_comments == ['First comment', 'Second comment']
+
+    # Verify other fields are set correctly
+    assert prs[0].number == 1
+    assert prs[0].title == 'Test PR'
+    assert prs[0].body == 'Test Body'
+    assert prs[0].owner == 'test-owner'
+    assert prs[0].repo == 'test-repo'
+    assert prs[0].head_branch == 'test-branch'
+
+def test_pr_handler_guess_success_only_review_comments(llm_success_response):
     # Create a PR handler instance
     handler = PRHandler('test-owner', 'test-repo', 'test-token')
     
@@ -181,22 +158,8 @@ def test_pr_handler_guess_success_only_review_comments():
     # Create mock LLM config
     llm_config = LLMConfig(model='test-model', api_key='test-key')
     
-    # Mock the LLM response
-    mock_response = MagicMock()
-    mock_response.choices = [
-        MagicMock(
-            message=MagicMock(
-                content="""--- success
-true
-
---- explanation
-The changes successfully address the review comments."""
-            )
-        )
-    ]
-    
     # Test the guess_success method
-    with patch('litellm.completion', return_value=mock_response):
+    with patch('litellm.completion', return_value=llm_success_response):
         success, success_list, explanation = handler.guess_success(issue, history, llm_config)
         
         # Verify the results
@@ -233,3 +196,220 @@ def test_pr_handler_guess_success_no_comments():
     assert success is False
     assert success_list is None
     assert explanation == "No feedback was found to process"
+
+def test_guess_success_reuses_verdict_for_same_inputs(llm_success_response):
+    # Create a PR handler instance
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        thread_comments=None,
+        closing_issues=['Issue description'],
+        review_comments=['Please fix the formatting'],
+        thread_ids=None,
+        head_branch='test-branch'
+    )
+    history = [MessageAction(content='Fixed the formatting')]
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    with patch('litellm.completion', return_value=llm_success_response) as mock_completion:
+        first = handler.guess_success(issue, history, llm_config)
+        second = handler.guess_success(issue, history, llm_config)
+
+        # The second call is answered from the cache
+        assert mock_completion.call_count == 1
+        assert first == second
+
+        # A different agent message is a different question
+        handler.guess_success(issue, [MessageAction(content='Reformatted the code')], llm_config)
+        assert mock_completion.call_count == 2
+
+def test_guess_success_cache_does_not_outlive_fast_path(monkeypatch, llm_success_response):
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        review_comments=['Add docstrings to parse_config'],
+        head_branch='test-branch'
+    )
+    history = [MessageAction(content='I added docstrings to parse_config')]
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    with patch('litellm.completion', return_value=llm_success_response) as mock_completion:
+        monkeypatch.setenv('OH_RESOLVER_FAST_PATH', '1')
+        assert handler.guess_success(issue, history, llm_config)[2].startswith('matched by heuristic')
+        assert mock_completion.call_count == 0
+
+        # Once the fast path is turned off, the heuristic verdict is not served from the cache
+        monkeypatch.delenv('OH_RESOLVER_FAST_PATH')
+        assert "successfully address" in handler.guess_success(issue, history, llm_config)[2]
+        assert mock_completion.call_count == 1
+
+def test_get_json_reuses_cached_pages(github_api):
+    url = f'{ISSUES_URL}/1/comments'
+    github_api.add('GET', url, json=[{'id': 1, 'body': 'First comment'}])
+
+    handler = IssueHandler('test-owner', 'test-repo', 'test-token')
+
+    assert handler._get_json(url, {'per_page': 100, 'page': 1}) == [{'id': 1, 'body': 'First comment'}]
+    assert handler._get_json(url, {'page': 1, 'per_page': 100}) == [{'id': 1, 'body': 'First comment'}]
+    assert len(github_api.calls) == 1
+
+    # Other pages are still downloaded
+    handler._get_json(url, {'per_page': 100, 'page': 2})
+    assert len(github_api.calls) == 2
+
+def test_handler_uses_pooled_session_with_retries():
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    assert handler._session.headers['Authorization'] == 'token test-token'
+
+    adapter = handler._session.get_adapter('https://api.github.com/graphql')
+    assert adapter.max_retries.total == 3
+    assert set(adapter.max_retries.status_forcelist) == {502, 503, 504}
+    assert 'POST' in adapter.max_retries.allowed_methods
+
+def test_paginate_prefetches_next_page():
+    handler = IssueHandler('test-owner', 'test-repo', 'test-token')
+    url = 'https://api.github.com/repos/test-owner/test-repo/issues'
+    pages = {1: [{'number': 1}], 2: [{'number': 2}], 3: []}
+    requested_pages = []
+    page_2_requested = threading.Event()
+
+    def get_json(url, params):
+        requested_pages.append(params['page'])
+        if params['page'] == 2:
+            page_2_requested.set()
+        return pages[params['page']]
+
+    with patch.object(handler, '_get_json', side_effect=get_json):
+        listing = handler._paginate(url, {'per_page': 100}, prefetch=True)
+        assert next(listing) == [{'number': 1}]
+
+        # Page 2 is requested in the background before the caller asks for it
+        assert page_2_requested.wait(timeout=5)
+        assert requested_pages == [1, 2]
+
+        assert list(listing) == [[{'number': 2}]]
+        assert requested_pages == [1, 2, 3]
+
+    # The prefetch thread is stopped once the listing is done
+    for thread in threading.enumerate():
+        if thread.name.startswith('github-prefetch'):
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+def test_get_json_revalidates_with_etag(github_api):
+    url = f'{ISSUES_URL}/1/comments'
+    github_api.add('GET', url, json=[{'id': 1, 'body': 'First comment'}], headers={'ETag': '"abc"'})
+    github_api.add('GET', url, status=304)
+
+    handler = IssueHandler('test-owner', 'test-repo', 'test-token')
+    params = {'per_page': 100, 'page': 1}
+
+    assert handler._get_json(url, params) == [{'id': 1, 'body': 'First comment'}]
+    assert 'If-None-Match' not in github_api.calls[-1].headers
+
+    # Once the cached page expires, it is requested conditionally
+    handler._response_cache.clear()
+    assert handler._get_json(url, params) == [{'id': 1, 'body': 'First comment'}]
+    assert github_api.calls[-1].headers['If-None-Match'] == '"abc"'
+    assert len(github_api.calls) == 2
+
+def test_prompt_templates_are_compiled_once():
+    first = _load_template('guess_success/pr-feedback-check.jinja')
+    assert _load_template('guess_success/pr-feedback-check.jinja') is first
+    assert _compile_template('Fix {{ body }}') is _compile_template('Fix {{ body }}')
+
+def make_pr(number, review_comment, body='Test Body', closing_issues=None):
+    """A PR with a single review comment, for the semantic cache tests."""
+    return GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=number,
+        title='Test PR',
+        body=body,
+        closing_issues=closing_issues,
+        review_comments=[review_comment],
+        head_branch='test-branch'
+    )
+
+def test_guess_success_semantic_cache(monkeypatch, llm_success_response):
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    feedback = 'Please fix the formatting of the imports in the resolver module and run the linter'
+    history = [MessageAction(content='Fixed the import formatting in the resolver module and ran the linter')]
+
+    with patch('litellm.completion', return_value=llm_success_response) as mock_completion:
+        # Without the flag, every distinct PR is checked with the LLM
+        handler.guess_success(make_pr(1, feedback), history, llm_config)
+        handler.guess_success(make_pr(2, feedback + '.'), history, llm_config)
+        assert mock_completion.call_count == 2
+
+        monkeypatch.setenv('OH_RESOLVER_SEMANTIC_CACHE', '1')
+        first = handler.guess_success(make_pr(3, feedback), history, llm_config)
+        assert mock_completion.call_count == 3
+
+        # Nearly identical feedback reuses the verdict
+        assert handler.guess_success(make_pr(4, feedback + ' please'), history, llm_config) == first
+        assert mock_completion.call_count == 3
+
+        # A different agent message is asked about again
+        handler.guess_success(make_pr(5, feedback), [MessageAction(content='Added a new test')], llm_config)
+        assert mock_completion.call_count == 4
+
+def test_guess_success_semantic_cache_matches_agent_message_exactly(monkeypatch, llm_success_response):
+    monkeypatch.setenv('OH_RESOLVER_SEMANTIC_CACHE', '1')
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    fixed = (
+        'I fixed the import formatting in the resolver module, updated the configuration loader to read the '
+        'new settings file, added unit tests for the parser and the loader, and verified that the full test '
+        'suite passes. The linter warnings about unused imports and the formatting issues in the handler '
+        'module were fixed as well.'
+    )
+    not_fixed = (
+        'I fixed the import formatting in the resolver module, updated the configuration loader to read the '
+        'new settings file, added unit tests for the parser and the loader, and found that the full test '
+        'suite still fails. The linter warnings about unused imports and the formatting issues in the handler '
+        'module were not fixed.'
+    )
+    # By word counts, the negated message looks nearly like the same answer
+    vectors = [SemanticCache._vectorize(message) for message in (fixed, not_fixed)]
+    assert SemanticCache._similarity(*vectors) > 0.9
+
+    with patch('litellm.completion', return_value=llm_success_response) as mock_completion:
+        handler.guess_success(make_pr(1, 'Please fix the formatting and make sure the tests pass'), [MessageAction(content=fixed)], llm_config)
+        handler.guess_success(make_pr(2, 'Please fix the formatting and make sure the tests pass'), [MessageAction(content=not_fixed)], llm_config)
+        assert mock_completion.call_count == 2
+
+def test_guess_success_semantic_cache_compares_feedback_only(monkeypatch, llm_success_response):
+    monkeypatch.setenv('OH_RESOLVER_SEMANTIC_CACHE', '1')
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+    history = [MessageAction(content='Renamed load_config to read_config and added a unit test')]
+
+    # A long body and closing issue shared by both PRs must not drown out their different feedback
+    body = ' '.join(['The configuration loader reads settings from several files and merges them.'] * 20)
+    closing_issues = [' '.join(['Loading configuration is slow and the function names are confusing.'] * 20)]
+
+    with patch('litellm.completion', return_value=llm_success_response) as mock_completion:
+        handler.guess_success(make_pr(1, 'Rename load_config to read_config', body, closing_issues), history, llm_config)
+        handler.guess_success(make_pr(2, 'Add a unit test for the empty file case', body, closing_issues), history, llm_config)
+        assert mock_completion.call_count == 2
+
+        # The same words in a different order are different feedback
+        handler.guess_success(make_pr(3, 'Rename read_config to load_config', body, closing_issues), history, llm_config)
+        handler.guess_success(make_pr(4, 'Move the parser before the loader'), history, llm_config)
+        handler.guess_success(make_pr(5, 'Move the loader before the parser'), history, llm_config)
+        assert mock_completion.call_count == 5
@@ -65,19 +65,24 @@ The changes successfully address the feedback."""
         
         # Verify the litellm.completion() calls
         assert mock_completion.call_count == 2  # One call per review thread
+        assert success_list == [True, True]
         
+        # Review threads are checked concurrently, so match calls by content
+        prompts = [call[1]['messages'][1]['content'] for call in mock_completion.call_args_list]
+
+        # The issue descriptions are part of the system message shared by both calls
+        system_prompts = [call[1]['messages'][0]['content'] for call in mock_completion.call_args_list]
+        assert system_prompts[0] == system_prompts[1]
+        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in system_prompts[0]
+
         # Check first call
-        first_call = mock_completion.call_args_list[0]
-        first_prompt = first_call[1]['messages'][0]['content']
-        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in first_prompt
+        first_prompt = next(prompt for prompt in prompts if 'Please fix the formatting' in prompt)
         assert 'Feedback:\nPlease fix the formatting\n---\nlatest feedback:\nAdd docstrings' in first_prompt
         assert 'Files locations:\n' + json.dumps(['/src/file1.py', '/src/file2.py'], indent=4) in first_prompt
         assert 'Last message from AI agent:\n' + history[0].content in first_prompt
         
         # Check second call
-        second_call = mock_completion.call_args_list[1]
-        second_prompt = second_call[1]['messages'][0]['content']
-        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in second_prompt
+        second_prompt = next(prompt for prompt in prompts if 'Add more tests' in prompt)
         assert 'Feedback:\nAdd more tests\n---\nlatest feedback:\nAdd test cases' in second_prompt
         assert 'Files locations:\n' + json.dumps(['/tests/test_file.py'], indent=4) in second_prompt
         assert 'Last message from AI agent:\n' + history[0].content in second_prompt
@@ -136,10 +141,10 @@ The changes successfully address the feedback."""
         # Verify the litellm.completion() call
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        prompt = call_args[1]['messages'][0]['content']
+        prompt = call_args[1]['messages'][1]['content']
         
         # Check prompt content
-        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in prompt
+        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in call_args[1]['messages'][0]['content']
         assert 'PR Thread Comments:\n' + '\n---\n'.join(issue.thread_comments) in prompt
         assert 'Last message from AI agent:\n' + history[0].content in prompt
 
@@ -153,6 +158,18 @@ def test_check_feedback_with_llm():
     
     # Test cases for different LLM responses
     test_cases = [
+        {
+            'response': '{"success": true, "explanation": "Changes look good"}',
+            'expected': (True, 'Changes look good')
+        },
+        {
+            'response': '{"success": false, "explanation": "Not all issues fixed"}',
+            'expected': (False, 'Not all issues fixed')
+        },
+        {
+            'response': '```json\n{"success": true, "explanation": "Multiline\\nexplanation"}\n```',
+            'expected': (True, 'Multiline\nexplanation')
+        },
         {
             'response': '--- success\ntrue\n--- explanation\nChanges look good',
             'expected': (True, 'Changes look good')
@@ -184,7 +201,7 @@ def test_check_feedback_with_llm():
         
         # Test the function
         with patch('litellm.completion', return_value=mock_response):
-            success, explanation = handler._check_feedback_with_llm('test prompt', llm_config)
+            success, explanation = handler._check_feedback_with_llm('test system prompt', 'test prompt', llm_config)
             assert (success, explanation) == case['expected']
 
 def test_check_review_thread():
@@ -223,10 +240,10 @@ Changes look good"""
         # Verify the litellm.completion() call
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        prompt = call_args[1]['messages'][0]['content']
+        prompt = call_args[1]['messages'][1]['content']
         
         # Check prompt content
-        assert 'Issue descriptions:\n' + issues_context in prompt
+        assert 'Issue descriptions:\n' + issues_context in call_args[1]['messages'][0]['content']
         assert 'Feedback:\n' + review_thread.comment in prompt
         assert 'Files locations:\n' + json.dumps(review_thread.files, indent=4) in prompt
         assert 'Last message from AI agent:\n' + last_message in prompt
@@ -272,10 +289,10 @@ Changes look good"""
         # Verify the litellm.completion() call
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        prompt = call_args[1]['messages'][0]['content']
+        prompt = call_args[1]['messages'][1]['content']
         
         # Check prompt content
-        assert 'Issue descriptions:\n' + issues_context in prompt
+        assert 'Issue descriptions:\n' + issues_context in call_args[1]['messages'][0]['content']
         assert 'PR Thread Comments:\n' + '\n---\n'.join(thread_comments) in prompt
         assert 'Last message from AI agent:\n' + last_message in prompt
         
@@ -320,10 +337,10 @@ Changes look good"""
         # Verify the litellm.completion() call
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        prompt = call_args[1]['messages'][0]['content']
+        prompt = call_args[1]['messages'][1]['content']
         
         # Check prompt content
-        assert 'Issue descriptions:\n' + issues_context in prompt
+        assert 'Issue descriptions:\n' + issues_context in call_args[1]['messages'][0]['content']
         assert 'PR Review Comments:\n' + '\n---\n'.join(review_comments) in prompt
         assert 'Last message from AI agent:\n' + last_message in prompt
         
@@ -385,9 +402,210 @@ The changes successfully address the feedback."""
         # Verify the litellm.completion() call
         mock_completion.assert_called_once()
         call_args = mock_completion.call_args
-        prompt = call_args[1]['messages'][0]['content']
+        prompt = call_args[1]['messages'][1]['content']
         
         # Check prompt content
-        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in prompt
+        assert 'Issue descriptions:\n' + json.dumps(['Issue 1 description', 'Issue 2 description'], indent=4) in call_args[1]['messages'][0]['content']
         assert 'PR Review Comments:\n' + '\n---\n'.join(issue.review_comments) in prompt
-        assert 'Last message from AI agent:\n' + history[0].content in prompt
\ No newline at end of file
+        assert 'Last message from AI agent:\n' + history[0].content in prompt
+
+def test_check_feedback_with_llm_messages():
+    """Test that the instructions and issue descriptions are sent as a system message ahead of the check-specific prompt"""
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content='--- success\ntrue\n--- explanation\nChanges look good'
+            )
+        )
+    ]
+
+    # Models without prompt caching get plain string contents
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+    with patch('litellm.completion', return_value=mock_response) as mock_completion:
+        handler._check_feedback_with_llm('test system prompt', 'test prompt', llm_config)
+        assert mock_completion.call_args[1]['response_format'] == {'type': 'json_object'}
+        messages = mock_completion.call_args[1]['messages']
+        assert messages == [
+            {'role': 'system', 'content': 'test system prompt'},
+            {'role': 'user', 'content': 'test prompt'},
+        ]
+
+    # Models with prompt caching mark the system message as cacheable
+    llm_config = LLMConfig(model='anthropic/claude-3-5-sonnet-20241022', api_key='test-key')
+    with patch('litellm.completion', return_value=mock_response) as mock_completion:
+        handler._check_feedback_with_llm('test system prompt', 'test prompt', llm_config)
+        messages = mock_completion.call_args[1]['messages']
+        assert messages[0] == {
+            'role': 'system',
+            'content': [{'type': 'text', 'text': 'test system prompt', 'cache_control': {'type': 'ephemeral'}}],
+        }
+        assert messages[1] == {'role': 'user', 'content': 'test prompt'}
+
+def test_guess_success_fast_path(monkeypatch):
+    """Test that feedback covered by the agent's message skips the LLM when the fast path is enabled"""
+    monkeypatch.setenv('OH_RESOLVER_FAST_PATH', '1')
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        thread_comments=None,
+        closing_issues=['Issue 1 description'],
+        review_comments=None,
+        review_threads=[
+            ReviewThread(
+                comment='latest feedback:\nAdd docstrings to parse_config',
+                files=['/src/config.py']
+            ),
+            ReviewThread(
+                comment='latest feedback:\nHandle the timeout in fetch_remote',
+                files=['/src/remote.py']
+            )
+        ],
+        thread_ids=['1', '2'],
+        head_branch='test-branch'
+    )
+    history = [MessageAction(content='I added docstrings to parse_config in config.py')]
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content='--- success\nfalse\n--- explanation\nThe timeout is not handled'
+            )
+        )
+    ]
+
+    with patch('litellm.completion', return_value=mock_response) as mock_completion:
+        success, success_list, explanation = handler.guess_success(issue, history, llm_config)
+
+        # Only the thread that is not mentioned in the message goes to the LLM
+        mock_completion.assert_called_once()
+        assert 'fetch_remote' in mock_completion.call_args[1]['messages'][1]['content']
+        assert success is False
+        assert success_list == [True, False]
+        assert explanation == (
+            "matched by heuristic: the agent's last message mentions docstrings, parse_config\n"
+            "The timeout is not handled"
+        )
+
+def test_guess_success_fast_path_falls_back_to_llm(monkeypatch):
+    """Test that the fast path asks the LLM about missing or negated agent messages"""
+    monkeypatch.setenv('OH_RESOLVER_FAST_PATH', '1')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        thread_comments=None,
+        closing_issues=['Issue 1 description'],
+        review_comments=['Add docstrings to parse_config'],
+        thread_ids=None,
+        head_branch='test-branch'
+    )
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content='--- success\nfalse\n--- explanation\nNo docstrings were added'
+            )
+        )
+    ]
+
+    for message in (None, 'I could not add docstrings to parse_config'):
+        handler = PRHandler('test-owner', 'test-repo', 'test-token')
+        with patch('litellm.completion', return_value=mock_response) as mock_completion:
+            success, success_list, explanation = handler.guess_success(issue, [MessageAction(content=message)], llm_config)
+            mock_completion.assert_called_once()
+            assert success is False
+            assert explanation == 'No docstrings were added'
+
+def test_guess_success_fast_path_disabled(monkeypatch):
+    """Test that the LLM is always asked when the fast path is not enabled"""
+    monkeypatch.delenv('OH_RESOLVER_FAST_PATH', raising=False)
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        thread_comments=None,
+        closing_issues=['Issue 1 description'],
+        review_comments=['Add docstrings to parse_config'],
+        thread_ids=None,
+        head_branch='test-branch'
+    )
+    history = [MessageAction(content='I added docstrings to parse_config')]
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    mock_response = MagicMock()
+    mock_response.choices = [
+        MagicMock(
+            message=MagicMock(
+                content='--- success\ntrue\n--- explanation\nDocstrings were added'
+            )
+        )
+    ]
+
+    with patch('litellm.completion', return_value=mock_response) as mock_completion:
+        success, success_list, explanation = handler.guess_success(issue, history, llm_config)
+        mock_completion.assert_called_once()
+        assert success is True
+        assert success_list == [True]
+        assert explanation == 'Docstrings were added'
+
+def test_guess_success_review_threads_keeps_thread_order():
+    """Test that concurrently checked review threads report results in thread order"""
+    handler = PRHandler('test-owner', 'test-repo', 'test-token')
+
+    issue = GithubIssue(
+        owner='test-owner',
+        repo='test-repo',
+        number=1,
+        title='Test PR',
+        body='Test Body',
+        thread_comments=None,
+        closing_issues=['Issue 1 description'],
+        review_comments=None,
+        review_threads=[
+            ReviewThread(comment=f'latest feedback:\nFix thread {i}', files=[f'/src/file{i}.py'])
+            for i in range(6)
+        ],
+        thread_ids=[str(i) for i in range(6)],
+        head_branch='test-branch'
+    )
+    history = [MessageAction(content='I fixed the even threads')]
+    llm_config = LLMConfig(model='test-model', api_key='test-key')
+
+    def mock_completion(*args, **kwargs):
+        prompt = kwargs['messages'][1]['content']
+        thread = int(prompt.split('Fix thread ')[1][0])
+        response = MagicMock()
+        response.choices = [
+            MagicMock(
+                message=MagicMock(
+                    content=json.dumps({'success': thread % 2 == 0, 'explanation': f'Thread {thread}'})
+                )
+            )
+        ]
+        return response
+
+    with patch('litellm.completion', side_effect=mock_completion):
+        success, success_list, explanation = handler.guess_success(issue, history, llm_config)
+
+    assert success is False
+    assert success_list == [True, False, True, False, True, False]
+    assert explanation == '\n'.join(f'Thread {i}' for i in range(6))
@@ -1,3 +1,4 @@
+import json
 import os
 import tempfile
 import pytest
@@ -17,6 +18,11 @@ from openhands_resolver.resolver_output import ResolverOutput
 from openhands.core.config import LLMConfig
 
 
+ISSUES_URL = "https://api.github.com/repos/owner/repo/issues"
+PULLS_URL = "https://api.github.com/repos/owner/repo/pulls"
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+
 @pytest.fixture
 def mock_output_dir():
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -86,32 +92,19 @@ def test_initialize_runtime():
     )
 
 
-def test_download_issues_from_github():
+def test_download_issues_from_github(github_api):
     handler = IssueHandler("owner", "repo", "token")
 
+    github_api.add("GET", ISSUES_URL, json=[
+        {"number": 1, "title": "Issue 1", "body": "This is an issue"},
+        {"number": 2, "title": "PR 1", "body": "This is a pull request", "pull_request": {}},
+        {"number": 3, "title": "Issue 2", "body": "This is another issue"},
+    ], params={"page": 1})
+    github_api.add("GET", ISSUES_URL, json=[])
+    for number in (1, 3):
+        github_api.add("GET", f"{ISSUES_URL}/{number}/comments", json=[])
 
-    mock_issues_response = MagicMock()
-    mock_issues_response.json.side_effect = [
-        [
-            {"number": 1, "title": "Issue 1", "body": "This is an issue"},
-            {"number": 2, "title": "PR 1", "body": "This is a pull request", "pull_request": {}},
-            {"number": 3, "title": "Issue 2", "body": "This is another issue"},
-        ],
-        None,
-    ]
-    mock_issues_response.raise_for_status = MagicMock()
-
-    mock_comments_response = MagicMock()
-    mock_comments_response.json.return_value = []
-    mock_comments_response.raise_for_status = MagicMock()
-
-    def get_mock_response(url, *args, **kwargs):
-        if "/comments" in url:
-            return mock_comments_response
-        return mock_issues_response
-
-    with patch('requests.get', side_effect=get_mock_response):
-        issues = handler.get_converted_issues()
+    issues = handler.get_converted_issues()
 
     assert len(issues) == 2
     assert handler.issue_type == "issue"
@@ -123,30 +116,24 @@ def test_download_issues_from_github():
     assert [issue.thread_ids for issue in issues] == [None, None]
 
 
-def test_download_pr_from_github():
+def test_download_pr_from_github(github_api):
     handler = PRHandler("owner", "repo", "token")
-    mock_pr_response = MagicMock()
-    mock_pr_response.json.side_effect = [
-        [
-            {"number": 1, "title": "PR 1", "body": "This is a pull request", "head": {"ref": "b1"}},
-            {"number": 2, "title": "My PR", "body": "This is another pull request", "head": {"ref": "b2"}},
-            {"number": 3, "title": "PR 3", "body": "Final PR", "head": {"ref": "b3"}},
-        ],
-        None,
-    ]
-    mock_pr_response.raise_for_status = MagicMock()
-
-    # Mock for PR comments response
-    mock_comments_response = MagicMock()
-    mock_comments_response.json.return_value = []  # No PR comments
-    mock_comments_response.raise_for_status = MagicMock()
-
-    # Mock for GraphQL request (for download_pr_metadata)
-    mock_graphql_response = MagicMock()
-    mock_graphql_response.json.side_effect = lambda: {
+    github_api.add("GET", PULLS_URL, json=[
+        {"number": 1, "title": "PR 1", "body": "This is a pull request", "head": {"ref": "b1"}},
+        {"number": 2, "title": "My PR", "body": "This is another pull request", "head": {"ref": "b2"}},
+        {"number": 3, "title": "PR 3", "body": "Final PR", "head": {"ref": "b3"}},
+    ], params={"page": 1})
+    github_api.add("GET", PULLS_URL, json=[])
+
+    # No PR comments
+    for number in (1, 2, 3):
+        github_api.add("GET", f"{ISSUES_URL}/{number}/comments", json=[])
+
+    # GraphQL response for download_pr_metadata
+    github_api.add("POST", GRAPHQL_URL, json={
         "data": {
             "repository": {
-                "pullRequest": {
+                "pr1": {
                     "closingIssuesReferences": {
                         "edges": [
                             {"node": {"body": "Issue 1 body"}},
@@ -194,18 +181,17 @@ def test_download_pr_from_github():
                 }
             }
         }
-    }
-
-    mock_graphql_response.raise_for_status = MagicMock()
+    })
 
-    def get_mock_response(url, *args, **kwargs):
-        if "/comments" in url:
-            return mock_comments_response
-        return mock_pr_response
+    issues = handler.get_converted_issues()
 
-    with patch('requests.get', side_effect=get_mock_response):
-        with patch('requests.post', return_value=mock_graphql_response):  
-            issues = handler.get_converted_issues()
+    # Metadata for all PRs is fetched in a single batched GraphQL query
+    graphql_requests = github_api.requests_to("POST", GRAPHQL_URL)
+    assert len(graphql_requests) == 1
+    query = json.loads(graphql_requests[0].body)["query"]
+    assert "pr1: pullRequest(number: 1)" in query
+    assert "pr2: pullRequest(number: 2)" in query
+    assert "pr3: pullRequest(number: 3)" in query
 
     assert len(issues) == 3
     assert handler.issue_type == "pr"
@@ -674,28 +660,21 @@ def test_guess_success_invalid_output():
         assert explanation == "Failed to decode answer from LLM response: This is not a valid output"
 
 
-def test_download_pr_with_review_comments():
+def test_download_pr_with_review_comments(github_api):
     handler = PRHandler("owner", "repo", "token")
-    mock_pr_response = MagicMock()
-    mock_pr_response.json.side_effect = [
-        [
-            {"number": 1, "title": "PR 1", "body": "This is a pull request", "head": {"ref": "b1"}},
-        ],
-        None,
-    ]
-    mock_pr_response.raise_for_status = MagicMock()
+    github_api.add("GET", PULLS_URL, json=[
+        {"number": 1, "title": "PR 1", "body": "This is a pull request", "head": {"ref": "b1"}},
+    ], params={"page": 1})
+    github_api.add("GET", PULLS_URL, json=[])
 
-    # Mock for PR comments response
-    mock_comments_response = MagicMock()
-    mock_comments_response.json.return_value = []  # No PR comments
-    mock_comments_response.raise_for_status = MagicMock()
+    # No PR comments
+    github_api.add("GET", f"{ISSUES_URL}/1/comments", json=[])
 
-    # Mock for GraphQL request with review comments but no threads
-    mock_graphql_response = MagicMock()
-    mock_graphql_response.json.side_effect = lambda: {
+    # GraphQL response with review comments but no threads
+    github_api.add("POST", GRAPHQL_URL, json={
         "data": {
             "repository": {
-                "pullRequest": {
+                "pr1": {
                     "closingIssuesReferences": {
                         "edges": []
                     },
@@ -708,18 +687,9 @@ def test_download_pr_with_review_comments():
                 }
             }
         }
-    }
-
-    mock_graphql_response.raise_for_status = MagicMock()
-
-    def get_mock_response(url, *args, **kwargs):
-        if "/comments" in url:
-            return mock_comments_response
-        return mock_pr_response
+    })
 
-    with patch('requests.get', side_effect=get_mock_response):
-        with patch('requests.post', return_value=mock_graphql_response):  
-            issues = handler.get_converted_issues()
+    issues = handler.get_converted_issues()
 
     assert len(issues) == 1
     assert handler.issue_type == "pr"
@@ -736,39 +706,22 @@ def test_download_pr_with_review_comments():
     assert not issues[0].closing_issues
     assert not issues[0].thread_ids
 
-def test_download_issue_with_specific_comment():
+def test_download_issue_with_specific_comment(github_api):
     handler = IssueHandler("owner", "repo", "token")
     
     # Define the specific comment_id to filter
     specific_comment_id = 101
 
-    # Mock issue and comment responses
-    mock_issue_response = MagicMock()
-    mock_issue_response.json.side_effect = [
-        [
-            {"number": 1, "title": "Issue 1", "body": "This is an issue"},
-        ],
-        None,
-    ]
-    mock_issue_response.raise_for_status = MagicMock()
-
-    mock_comments_response = MagicMock()
-    mock_comments_response.json.return_value = [
+    github_api.add("GET", ISSUES_URL, json=[
+        {"number": 1, "title": "Issue 1", "body": "This is an issue"},
+    ], params={"page": 1})
+    github_api.add("GET", ISSUES_URL, json=[])
+    github_api.add("GET", f"{ISSUES_URL}/1/comments", json=[
         {"id": specific_comment_id, "body": "Specific comment body", "issue_url": "https://api.github.com/repos/owner/repo/issues/1"},
         {"id": 102, "body": "Another comment body", "issue_url": "https://api.github.com/repos/owner/repo/issues/2"},
-    ]
-    mock_comments_response.raise_for_status = MagicMock()
-
-
-    def get_mock_response(url, *args, **kwargs):
-        if "/comments" in url:
-            return mock_comments_response
-        
-        return mock_issue_response
-
+    ])
 
-    with patch('requests.get', side_effect=get_mock_response):
-        issues = handler.get_converted_issues(comment_id=specific_comment_id)
+    issues = handler.get_converted_issues(comment_id=specific_comment_id)
 
     assert len(issues) == 1
     assert issues[0].number == 1